@@ -5,71 +5,118 @@ including main classes or functions inside each file, outputs, and approximate c
 """
 
 import ast
+import builtins
+import functools
 import os
-from graphviz import Digraph
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import importlib.util
 
-# Global sequence counter
-call_sequence_counter = 0  # Start at 0
+# Functions treated as producing output (checked for every call, so a frozenset)
+OUTPUT_FUNCS = frozenset({'print', 'logging.info', 'logging.debug', 'logging.error'})
 
-class ExecutionFlowVisitor(ast.NodeVisitor):
+# Built-in names (len, str, range, ...) can never resolve to a project file,
+# so calls to them are filtered out before they reach the resolution step
+BUILTIN_NAMES = frozenset(dir(builtins))
+
+# PyCF_ONLY_AST ignores the optimize argument for the tree it returns; only
+# PyCF_OPTIMIZED_AST (Python 3.13+) yields the optimized, docstring-stripped
+# tree, so request it where available and fall back to the plain AST elsewhere
+_AST_FLAGS = ast.PyCF_ONLY_AST | getattr(ast, 'PyCF_OPTIMIZED_AST', 0)
+
+# os.path.abspath issues a getcwd() syscall for every relative path; the
+# working directory never changes here, so resolve against one cached value
+_CWD = os.getcwd()
+
+def _abspath(path):
+    if not os.path.isabs(path):
+        path = os.path.join(_CWD, path)
+    return os.path.normpath(path)
+
+class ExecutionFlowVisitor:
     """
-    AST Visitor class that traverses the AST of a Python file to collect information
-    about imports, function calls, classes, functions, and outputs.
+    Collects information about imports, function calls, classes, functions,
+    and outputs from the AST of a Python file.
+
+    Traversal is a single flat loop over ast.walk with direct type checks,
+    avoiding the per-node method dispatch of ast.NodeVisitor.
     """
+    # Fixed slots instead of a per-instance __dict__: faster attribute access
+    # on the hot traversal path and less memory per visitor
+    __slots__ = ('filename', 'func_to_file', 'imports', 'outputs',
+                 'classes', 'functions', 'callers', 'callees',
+                 '_pending_calls')
+
     def __init__(self, filename, func_to_file):
-        self.filename = os.path.abspath(filename)    # Absolute path of the file being analyzed
+        # Interned: the path recurs as a dict key and in every recorded tuple
+        self.filename = sys.intern(_abspath(filename))
         self.func_to_file = func_to_file             # Mapping of function names to file paths
-        self.imports = set()                         # Set of tuples (importer_file, imported_module)
-        self.function_calls = set()                  # Set of tuples (caller_file, callee_file)
+        self.imports = []                            # Tuples (importer_file, imported_module); deduplicated after the walk
         self.outputs = set()                         # Set of output functions used in this file
         self.classes = set()                         # Set of class names defined in this file
         self.functions = set()                       # Set of function names defined in this file (not in classes)
-        self.current_class = None                    # Name of the current class being visited
-        self.current_function = None                 # Name of the current function being visited
-        self.calls_with_sequence = []                # List of tuples: (sequence_number, caller_file, callee_file)
-
-    def visit_Import(self, node):
-        for alias in node.names:
-            module_name = alias.name
-            self.imports.add((self.filename, module_name))
-        self.generic_visit(node)
-
-    def visit_ImportFrom(self, node):
-        module = node.module
-        for alias in node.names:
-            imported_module = f"{module}.{alias.name}" if module else alias.name
-            self.imports.add((self.filename, imported_module))
-        self.generic_visit(node)
-
-    def visit_ClassDef(self, node):
-        class_name = node.name
-        self.classes.add(class_name)
-        self.current_class = class_name
-        self.generic_visit(node)
-        self.current_class = None
-
-    def visit_FunctionDef(self, node):
-        function_name = node.name
-        if self.current_class is None:
-            self.functions.add(function_name)
-        self.generic_visit(node)
-
-    def visit_Call(self, node):
-        global call_sequence_counter  # Use the global sequence counter
+        self.callers = []                            # Caller file per resolved call, in source order
+        self.callees = []                            # Callee file per resolved call; index i pairs with callers[i]
+        self._pending_calls = []                     # Call names in source order, resolved after all files are visited
+
+    def visit(self, tree):
+        # ast.walk yields parents before children, so a method's enclosing
+        # ClassDef has already registered it here by the time the FunctionDef
+        # comes up -- no current_class state needed.
+        method_ids = set()
+        func_to_file = self.func_to_file
+        for node in ast.walk(tree):
+            node_type = type(node)
+            if node_type is ast.Call:
+                self.handle_call(node)
+            elif node_type is ast.Import:
+                for alias in node.names:
+                    # Appending to a list skips the hash-and-compare of set add
+                    self.imports.append((self.filename, alias.name))
+            elif node_type is ast.ImportFrom:
+                module = node.module
+                for alias in node.names:
+                    imported_module = f"{module}.{alias.name}" if module else alias.name
+                    self.imports.append((self.filename, imported_module))
+            elif node_type is ast.ClassDef:
+                class_name = node.name
+                self.classes.add(class_name)
+                func_to_file[sys.intern(class_name)] = self.filename
+                for body_item in node.body:
+                    if isinstance(body_item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        method_ids.add(id(body_item))
+                        func_to_file[sys.intern(f"{class_name}.{body_item.name}")] = self.filename
+            elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+                if id(node) not in method_ids:
+                    self.functions.add(node.name)
+                    func_to_file[sys.intern(node.name)] = self.filename
+
+    def handle_call(self, node):
         func_name = self.get_func_name(node)
         if func_name:
-            callee_file = self.find_callee_file(func_name)
-            caller_file = self.filename
-            if callee_file and callee_file != caller_file:
-                # Increment the global call sequence counter
-                call_sequence_counter += 1
-                # Record the function call with sequence number
-                self.calls_with_sequence.append((call_sequence_counter, caller_file, callee_file))
             # Check for output functions like print or logger
-            if func_name in ('print', 'logging.info', 'logging.debug', 'logging.error'):
+            if func_name in OUTPUT_FUNCS:
                 self.outputs.add(func_name)
-        self.generic_visit(node)
+            if func_name in BUILTIN_NAMES:
+                # Builtin call -- cannot be defined in a project file
+                return
+            # Defer the lookup: the defining file may not have been visited yet
+            self._pending_calls.append(func_name)
+
+    def resolve_calls(self):
+        # Cheap prescan: isdisjoint short-circuits in C, skipping the loop
+        # for files that call nothing defined elsewhere in the project
+        if self.func_to_file.keys().isdisjoint(self._pending_calls):
+            return
+        caller_file = self.filename
+        for func_name in self._pending_calls:
+            callee_file = self.find_callee_file(func_name)
+            if callee_file and callee_file != caller_file:
+                # Record the function call in two parallel lists (no tuple per
+                # call); sequence numbers are assigned after the merge
+                self.callers.append(caller_file)
+                self.callees.append(callee_file)
 
     def get_func_name(self, node):
         if isinstance(node.func, ast.Name):
@@ -81,133 +128,199 @@ class ExecutionFlowVisitor(ast.NodeVisitor):
     def get_attribute_name(self, node):
         parts = []
         while isinstance(node, ast.Attribute):
-            parts.insert(0, node.attr)
+            parts.append(node.attr)
             node = node.value
         if isinstance(node, ast.Name):
-            parts.insert(0, node.id)
-        return '.'.join(parts)
+            parts.append(node.id)
+        return '.'.join(reversed(parts))
 
     def find_callee_file(self, func_name):
         return self.func_to_file.get(func_name)
 
-def parse_file(file_path, func_to_file):
-    with open(file_path, "r", encoding='utf-8') as file:
-        source_code = file.read()
-    tree = ast.parse(source_code)
+def parse_tree(file_path, tree, func_to_file):
     visitor = ExecutionFlowVisitor(file_path, func_to_file)
     visitor.visit(tree)
     return visitor
 
-def build_function_to_file_map(py_files):
-    func_to_file = {}
-    for file_path in py_files:
-        with open(file_path, "r", encoding='utf-8') as file:
-            source_code = file.read()
-        tree = ast.parse(source_code)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_name = node.name
-                func_to_file[func_name] = os.path.abspath(file_path)
-            elif isinstance(node, ast.ClassDef):
-                class_name = node.name
-                func_to_file[class_name] = os.path.abspath(file_path)
-                for body_item in node.body:
-                    if isinstance(body_item, ast.FunctionDef):
-                        method_name = body_item.name
-                        full_name = f"{class_name}.{method_name}"
-                        func_to_file[full_name] = os.path.abspath(file_path)
-    return func_to_file
-
+def _parse_one(file_path):
+    # Worker function: returns plain picklable data (AST objects do not
+    # cross process boundaries reliably)
+    with open(file_path, "r", encoding='utf-8') as f:
+        source_code = f.read()
+    # Compile to an AST with the real path so SyntaxErrors name the file; on
+    # 3.13+ _AST_FLAGS also gets docstrings stripped so the walk visits fewer
+    # Constant nodes, on older versions the tree matches ast.parse exactly
+    tree = compile(source_code, file_path, 'exec',
+                   flags=_AST_FLAGS, dont_inherit=True, optimize=2)
+    visitor = parse_tree(file_path, tree, {})
+    # Deduplicate the accumulated imports once, preserving source order
+    visitor.imports = list(dict.fromkeys(visitor.imports))
+    return (visitor.filename, visitor.imports, visitor.outputs, visitor.classes,
+            visitor.functions, visitor.func_to_file, visitor._pending_calls)
+
+@functools.lru_cache(maxsize=None)
 def find_source_file(module_name):
+    # Cached: the same module names recur across files and find_spec is expensive
     try:
         spec = importlib.util.find_spec(module_name)
         if spec and spec.origin and spec.origin.endswith('.py'):
-            return os.path.abspath(spec.origin)
+            return _abspath(spec.origin)
     except ModuleNotFoundError:
         pass
     return None
 
+# Below this many files a process pool costs more to spawn than it saves
+PARALLEL_THRESHOLD = 32
+
+# Directories that never contain project sources worth diagramming; hidden
+# directories (.git, .tox, ...) are skipped by the leading-dot check too
+SKIP_DIRS = frozenset({
+    '.git', '.venv', 'venv', '__pycache__', 'node_modules',
+    'build', 'dist', '.tox', '.mypy_cache', 'site-packages',
+})
+
 def analyze_project():
     visitors = {}
     py_files = []
 
-    # Collect all .py files in the project directory
-    for root, _, files in os.walk('.'):
-        for file in files:
-            if file.endswith('.py'):
-                py_files.append(os.path.join(root, file))
-
-    # Build function-to-file map
-    func_to_file = build_function_to_file_map(py_files)
-
-    # Parse each file
-    for file_path in py_files:
-        visitor = parse_file(file_path, func_to_file)
-        visitors[os.path.abspath(file_path)] = visitor
-
-    return visitors
-
-def create_execution_diagram(visitors, output_file="execution_flow"):
-    dot = Digraph(format="pdf")
-    dot.attr(rankdir="LR")
-
-    # Define node styles
-    dot.node_attr.update(style='filled', shape='box', fillcolor='lightyellow', fontname='Courier')
-    dot.edge_attr.update(arrowsize='0.7')
-
-    # Add nodes for each .py file
-    for file_path, visitor in visitors.items():
-        filename = os.path.basename(file_path)
-        label_parts = [filename]
-
-        # Add horizontal line
-        separator = '\n' + '-' * 20 + '\n'
-
-        # Include classes or functions
-        if visitor.classes:
-            classes = '\n'.join(sorted(visitor.classes))
-            label_parts.extend([separator, classes])
-        elif visitor.functions:
-            functions = '\n'.join(sorted(visitor.functions))
-            label_parts.extend([separator, functions])
-        else:
-            label_parts.extend([separator, "(No classes or functions)"])
-
-        # Include outputs if any
-        if visitor.outputs:
-            outputs = '\n'.join(sorted(visitor.outputs))
-            label_parts.extend([separator, "Outputs:", outputs])
-
-        # Final separator
-        label_parts.append(separator)
-
-        label = ''.join(label_parts)
-        dot.node(file_path, label=label)
-
-    # Collect all calls with sequence numbers from all visitors
-    all_calls_with_sequence = []
+    # Collect all .py files in the project directory.
+    # os.scandir with an explicit stack skips the extra stat() calls os.walk makes.
+    stack = ['.']
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Prune virtualenvs, caches, and hidden directories
+                        if entry.name not in SKIP_DIRS and not entry.name.startswith('.'):
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.py'):
+                        py_files.append(entry.path)
+        except OSError:
+            # Skip directories that cannot be listed (permissions, stale
+            # mounts), matching the silent-skip behavior of os.walk
+            continue
+
+    # Parsing is independent per file, so fan it out; executor.map preserves
+    # input order, which keeps the call sequence deterministic
+    executor_cls = ProcessPoolExecutor if len(py_files) >= PARALLEL_THRESHOLD else ThreadPoolExecutor
+    with executor_cls() as executor:
+        results = list(executor.map(_parse_one, py_files, chunksize=8))
+
+    # Merge the per-file definitions into the shared function-to-file map.
+    # Strings from worker processes are fresh objects, so intern them here.
+    func_to_file = {}
+    for result in results:
+        for name, path in result[5].items():
+            func_to_file[sys.intern(name)] = sys.intern(path)
+
+    # Rebuild a visitor per file from the worker results
+    for abs_path, imports, outputs, classes, functions, _, pending_calls in results:
+        visitor = ExecutionFlowVisitor(abs_path, func_to_file)
+        visitor.imports = imports
+        visitor.outputs = outputs
+        visitor.classes = classes
+        visitor.functions = functions
+        visitor._pending_calls = pending_calls
+        visitors[abs_path] = visitor
+
+    # Resolve the buffered call names now that every definition is known
     for visitor in visitors.values():
-        all_calls_with_sequence.extend(visitor.calls_with_sequence)
-
-    # Sort all calls by sequence number
-    all_calls_with_sequence.sort(key=lambda x: x[0])
+        visitor.resolve_calls()
 
-    # Add edges for function calls between files with sequence numbers
-    for seq_num, caller_file, callee_file in all_calls_with_sequence:
-        if callee_file and callee_file in visitors:
-            dot.edge(caller_file, callee_file, label=f'call {seq_num}', color='black')
+    return visitors
 
-    # Add edges for imports
-    for visitor in visitors.values():
-        for importer_file, imported_module in visitor.imports:
-            imported_file = find_source_file(imported_module)
-            if imported_file and imported_file in visitors:
-                dot.edge(importer_file, imported_file, label='imports', color='blue')
+def _quote(text):
+    # Escape a string for use inside a double-quoted DOT identifier or label
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
 
-    # Save the graph
-    dot.render(output_file, cleanup=False)
+def create_execution_diagram(visitors, output_file="execution_flow"):
+    # DOT source is streamed straight into the .gv file through a large write
+    # buffer instead of being accumulated in memory; the dot executable then
+    # renders the PDF from it
+    dot_file = f"{output_file}.gv"
+
+    # Quote each file path once; paths recur in every node and edge statement
+    quoted = {file_path: f'"{_quote(file_path)}"' for file_path in visitors}
+
+    with open(dot_file, "w", buffering=1 << 20, encoding='utf-8') as w:
+        w.write('digraph {\n')
+        w.write('  rankdir=LR\n')
+        w.write('  node [style=filled shape=box fillcolor=lightyellow fontname=Courier]\n')
+        w.write('  edge [arrowsize="0.7"]\n')
+
+        # Add nodes for each .py file
+        for file_path, visitor in visitors.items():
+            filename = os.path.basename(file_path)
+            label_parts = [filename]
+
+            # Add horizontal line
+            separator = '\n' + '-' * 20 + '\n'
+
+            # Include classes or functions
+            if visitor.classes:
+                classes = '\n'.join(sorted(visitor.classes))
+                label_parts.extend([separator, classes])
+            elif visitor.functions:
+                functions = '\n'.join(sorted(visitor.functions))
+                label_parts.extend([separator, functions])
+            else:
+                label_parts.extend([separator, "(No classes or functions)"])
+
+            # Include outputs if any
+            if visitor.outputs:
+                outputs = '\n'.join(sorted(visitor.outputs))
+                label_parts.extend([separator, "Outputs:", outputs])
+
+            # Final separator
+            label_parts.append(separator)
+
+            label = ''.join(label_parts)
+            w.write(f'  {quoted[file_path]} [label="{_quote(label)}"]\n')
+
+        # Concatenate the per-file parallel lists in visitor order; that order
+        # is deterministic, so numbering falls out of enumerate with no sort
+        all_callers = []
+        all_callees = []
+        for visitor in visitors.values():
+            all_callers.extend(visitor.callers)
+            all_callees.extend(visitor.callees)
+
+        # Write edges for function calls between files with sequence numbers
+        for seq_num, (caller_file, callee_file) in enumerate(zip(all_callers, all_callees), 1):
+            if callee_file and callee_file in visitors:
+                w.write(f'  {quoted[caller_file]} -> {quoted[callee_file]} [label="call {seq_num}" color=black]\n')
+
+        # Map dotted module names to the project's own files; find_source_file
+        # (find_spec) is only a fallback for names outside this map
+        local_modules = {}
+        for file_path in visitors:
+            relative_path = os.path.relpath(file_path, _CWD)
+            module_name = os.path.splitext(relative_path)[0].replace(os.sep, '.')
+            local_modules[module_name] = file_path
+
+        # Deduplicate import edges across visitors before emitting; call edges
+        # above stay distinct because each carries its own sequence number
+        import_edges = set()
+        for visitor in visitors.values():
+            for importer_file, imported_module in visitor.imports:
+                imported_file = (local_modules.get(imported_module)
+                                 or local_modules.get(imported_module.partition('.')[0])
+                                 or find_source_file(imported_module))
+                if imported_file and imported_file in visitors:
+                    import_edges.add((importer_file, imported_file))
+
+        # Write one edge from each importing file to the imported file
+        for importer_file, imported_file in sorted(import_edges):
+            w.write(f'  {quoted[importer_file]} -> {quoted[imported_file]} [label=imports color=blue]\n')
+
+        w.write('}\n')
+
+    # Render the streamed DOT source to a PDF file
+    subprocess.run(['dot', '-Tpdf', '-o', f"{output_file}.pdf", dot_file], check=True)
     print(f"Execution diagram generated: {output_file}.pdf")
-    print(f"DOT source file generated: {output_file}.gv")
+    print(f"DOT source file generated: {dot_file}")
 
 if __name__ == "__main__":
     visitors = analyze_project()